@@ -1,11 +1,12 @@
 import streamlit as st
-import plotly.graph_objects as go
 import random
 import math
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import astuple, dataclass
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
-import numpy as np  # needed for percentile
+from functools import lru_cache
+import numpy as np  # percentiles + precomputed simulation schedules
 ########################
 # 1) TAX & UTILITY FUNCS
 ########################
@@ -13,21 +14,30 @@ BASE_PERSONAL_ALLOWANCE = 12570
 BASE_BASIC_RATE_LIMIT = 50270
 BASE_HIGHER_RATE_LIMIT = 125140
 
+# Monte Carlo runs are split into chunks of at least this many (and under twice
+# this many) for the worker threads; below that the batch is faster on a single
+# core. The split depends only on the run count, never on the machine, so a seed
+# gives the same draws everywhere.
+MC_CHUNK_SIZE = 50_000
+
+# Storage type for the recorded (runs, years) path histories only. float32 keeps
+# ~7 significant digits (to the penny only below ~£167k), which is plenty for a
+# chart of yearly averages and halves the bytes stored. Return draws, running
+# portfolio state and success checks stay float64, so the simulation itself
+# matches the scalar loop.
+PATH_DTYPE = np.float32
+
 def calc_tax_annual(gross, pa, brt, hrt):
-    """Simple tiered UK tax calculation for a single year's withdrawal."""
-    if gross <= 0:
-        return 0.0
-    if gross <= pa:
-        return 0.0
-    tax = 0.0
-    basic_portion = max(0, min(gross, brt) - pa)
-    higher_portion = max(0, min(gross, hrt) - brt) if gross > brt else 0
-    additional_portion = max(0, gross - hrt) if gross > hrt else 0
-
-    tax += basic_portion * 0.20
-    tax += higher_portion * 0.40
-    tax += additional_portion * 0.45
-    return tax
+    """
+    Simple tiered UK tax calculation for a single year's withdrawal.
+    Straight-line clamps instead of branches, so it also works element-wise
+    on NumPy arrays of gross values.
+    """
+    basic_portion = np.maximum(np.minimum(gross, brt) - pa, 0.0)
+    higher_portion = np.maximum(np.minimum(gross, hrt) - brt, 0.0)
+    additional_portion = np.maximum(gross - hrt, 0.0)
+    tax = basic_portion * 0.20 + higher_portion * 0.40 + additional_portion * 0.45
+    return tax if np.ndim(tax) else float(tax)
 
 def calc_net_annual(gross, pa, brt, hrt):
     """Net after tax for a single year's withdrawal."""
@@ -36,19 +46,20 @@ def calc_net_annual(gross, pa, brt, hrt):
 def required_gross_annual_for_net_annual(net_annual, pa, brt, hrt):
     """
     How much gross do we need so that net is 'net_annual'?
-    Binary search, to handle tax tiers.
-    """
-    if net_annual <= 0:
-        return 0.0
-    low, high = 0.0, 2_000_000.0
-    for _ in range(50):
-        mid = (low + high) / 2.0
-        net = calc_net_annual(mid, pa, brt, hrt)
-        if net < net_annual:
-            low = mid
-        else:
-            high = mid
-    return high
+    Tax is piecewise-linear (0/20/40/45%), so invert it bracket by bracket
+    instead of searching. Works element-wise on NumPy arrays as well as scalars.
+    """
+    net_annual = np.maximum(net_annual, 0.0)
+    # net income at the top of the basic and higher bands
+    net_at_brt = pa + (brt - pa) * 0.80
+    net_at_hrt = net_at_brt + (hrt - brt) * 0.60
+
+    gross = np.select(
+        [net_annual <= pa, net_annual <= net_at_brt, net_annual <= net_at_hrt],
+        [net_annual, pa + (net_annual - pa) / 0.80, brt + (net_annual - net_at_brt) / 0.60],
+        default=hrt + (net_annual - net_at_hrt) / 0.55
+    )
+    return gross if np.ndim(gross) else float(gross)
 
 def get_tax_brackets_for_factor(factor):
     """Inflate bracket cutoffs by 'factor' for the year."""
@@ -60,6 +71,105 @@ def get_tax_brackets_for_factor(factor):
 ############################
 # 2) ANNUAL SIMULATION LOGIC
 ############################
+@lru_cache(maxsize=16)
+def _annual_dates(start_date, years):
+    """
+    start_date plus 0..years-1 years, built with plain date.replace instead of
+    one relativedelta per year. 29 Feb falls back to 28 Feb in non-leap years,
+    same as relativedelta did. Memoised on (start_date, years), which rarely
+    change between reruns; returned as a tuple so the shared copy stays immutable.
+    """
+    dates_list = []
+    for yr in range(years):
+        try:
+            dates_list.append(start_date.replace(year=start_date.year + yr))
+        except ValueError:
+            dates_list.append(start_date.replace(year=start_date.year + yr, day=28))
+    return tuple(dates_list)
+
+def _annual_schedules(
+    annual_deposit,
+    deposit_growth_rate,
+    annual_inflation_rate,
+    target_annual_living_cost,
+    years
+):
+    """
+    Path-independent per-year schedules, shared by every run with the same inputs:
+      - deposits: the deposit made in each year (growth already applied)
+      - gross_needed: gross withdrawal that nets that year's inflated living cost
+        under that year's inflated tax brackets
+    Net is monotonic in gross, so the retirement check
+    "net(rate * portfolio) >= cost" is the same as "rate * portfolio >= gross_needed".
+    """
+    growth_powers = np.arange(years, dtype=np.float64)
+    deposits = annual_deposit * (1 + deposit_growth_rate) ** growth_powers
+    annual_costs = target_annual_living_cost * (1 + annual_inflation_rate) ** growth_powers
+    tax_factors = (1 + annual_inflation_rate) ** growth_powers  # to inflate tax brackets
+    # brackets and gross needed for every year in one vectorised pass
+    gross_needed = required_gross_annual_for_net_annual(
+        annual_costs, *get_tax_brackets_for_factor(tax_factors)
+    )
+    return deposits, gross_needed
+
+def _simulate_core_annual(
+    initial_deposit,
+    deposits,               # per-year deposit schedule (growth already applied)
+    annual_returns,         # per-year random returns
+    gross_needed,           # per-year gross that nets the living cost (see _annual_schedules)
+    annual_withdrawal_rate,
+    mode
+):
+    """
+    Pure-numeric year loop: no dates, no RNG, only floats and preallocated arrays.
+    Returns (portfolio_values, withdrawal_values, start_idx, total_withdrawn),
+    where start_idx is the year index we retired in (-1 if never).
+    """
+    years = len(annual_returns)
+    portfolio_value = float(initial_deposit)
+    start_idx = -1
+
+    # track timeseries
+    portfolio_values = np.empty(years, dtype=np.float64)
+    withdrawal_values = np.empty(years, dtype=np.float64)
+
+    # Retiring is a one-way switch, so run the two phases as separate straight
+    # loops instead of testing a 'withdrawing' flag every year.
+    # Phase 1: deposit and grow until we can retire. No withdrawal in the
+    # retirement year itself.
+    first_withdrawal_yr = years
+    for yr in range(years):
+        # deposit schedule already includes growth
+        portfolio_value += deposits[yr]
+        portfolio_value *= (1 + annual_returns[yr])
+        portfolio_values[yr] = portfolio_value
+        if annual_withdrawal_rate * portfolio_value >= gross_needed[yr]:
+            start_idx = yr
+            first_withdrawal_yr = yr + 1
+            break
+    withdrawal_values[:first_withdrawal_yr] = 0.0
+
+    # Phase 2: retired -- no deposits, withdraw once per year
+    strict = (mode == "strict")
+    for yr in range(first_withdrawal_yr, years):
+        portfolio_value *= (1 + annual_returns[yr])
+
+        # Written as min/max clamps rather than nested ifs, same as the batch kernel.
+        if strict:
+            # Only withdraw exactly enough to net your cost (partial if portfolio too small)
+            withdrawal_amt = min(gross_needed[yr], max(portfolio_value, 0.0))
+        else:  # mode == "four_percent"
+            withdrawal_amt = max(min(annual_withdrawal_rate * portfolio_value, portfolio_value), 0.0)
+        portfolio_value -= withdrawal_amt
+
+        # track
+        portfolio_values[yr] = portfolio_value
+        withdrawal_values[yr] = withdrawal_amt
+
+    # One vectorised reduction at the end rather than a running sum in the loop
+    total_withdrawn = float(withdrawal_values.sum())
+    return portfolio_values, withdrawal_values, start_idx, total_withdrawn
+
 def simulate_investment_annual(
     initial_deposit,
     annual_deposit,
@@ -71,7 +181,8 @@ def simulate_investment_annual(
     years,
     annual_volatility,      # e.g. 0.15 => 15% stdev
     start_date,
-    mode="strict"           # or "four_percent"
+    mode="strict",          # or "four_percent"
+    rng=None                # np.random.Generator; a fresh one if None
 ):
     """
     We simulate year by year:
@@ -82,80 +193,130 @@ def simulate_investment_annual(
       4) If retired, we withdraw once per year (but skip the withdrawal the exact year we retire)
       5) Inflates living cost each year
       6) Inflates tax brackets each year
+    The year loop itself lives in _simulate_core_annual; this wrapper builds the
+    schedules up front and maps the retirement index back onto a date.
     """
-    portfolio_value = float(initial_deposit)
-    current_annual_deposit = float(annual_deposit)
-    current_annual_cost = float(target_annual_living_cost)
-    tax_factor = 1.0  # to inflate tax brackets
+    if rng is None:
+        rng = np.random.default_rng()
+    annual_returns = rng.standard_normal(years)
+    annual_returns *= annual_volatility
+    annual_returns += annual_return_rate
+    deposits, gross_needed = _annual_schedules(
+        annual_deposit, deposit_growth_rate, annual_inflation_rate, target_annual_living_cost, years
+    )
+    dates_list = _annual_dates(start_date, years)
+
+    portfolio_values, withdrawal_values, start_idx, total_withdrawn = _simulate_core_annual(
+        initial_deposit,
+        deposits,
+        annual_returns,
+        gross_needed,
+        annual_withdrawal_rate,
+        mode
+    )
+    start_withdrawal_date = dates_list[start_idx] if start_idx >= 0 else None
 
-    withdrawing = False
-    start_withdrawal_date = None
-    total_withdrawn = 0.0
+    return (dates_list, portfolio_values, withdrawal_values,
+            start_withdrawal_date, total_withdrawn)
 
-    # track timeseries
-    year_list = []
-    dates_list = []
-    portfolio_values = []
-    withdrawal_values = []
+def simulate_batch_annual(
+    initial_deposit,
+    annual_deposit,
+    deposit_growth_rate,
+    annual_return_rate,
+    annual_inflation_rate,
+    annual_withdrawal_rate,
+    target_annual_living_cost,
+    years,
+    annual_volatility,
+    num_simulations,
+    mode="strict",
+    record_path=True,
+    record_portfolio=False,
+    rng=None
+):
+    """
+    Same rules as simulate_investment_annual, but every run is stepped together:
+    the portfolio is a (num_simulations,) array and each year is a handful of
+    vector ops instead of num_simulations scalar loops.
+    Returns (final_portfolio_values, start_idx, withdrawal_values), where the final
+    values are the float64 state, start_idx is -1 for runs that never retire and
+    withdrawal_values is the (num_simulations, years) PATH_DTYPE history.
+    With record_portfolio=True the (num_simulations, years) portfolio history is
+    appended as a fourth item; nothing in the app needs it, so it's off by default.
+    With record_path=False no per-year history is kept and we only return
+    (final_portfolio_values, start_idx) -- all a success count needs.
+    Pass a seeded np.random.Generator as rng for reproducible runs (None => fresh entropy).
+    """
+    # Deposits and gross needed only depend on the year, not the path
+    deposits, gross_needed = _annual_schedules(
+        annual_deposit, deposit_growth_rate, annual_inflation_rate, target_annual_living_cost, years
+    )
 
-    for yr in range(years):
-        current_year_date = start_date + relativedelta(years=yr)
+    # One bulk standard-normal draw for the whole batch, scaled in place
+    # (no per-draw Python calls). Laid out year-major so each year's returns
+    # are one contiguous row.
+    # Antithetic variates: only half the runs get fresh draws, the other half
+    # replay them negated. Each pair is still a fair sample, but a lucky path is
+    # matched by an unlucky one, so averages and success rates settle with
+    # fewer independent draws. With an odd count the last pair is cut short.
+    # Both halves are written into one preallocated matrix; the fresh half-size
+    # draw is the only temporary.
+    if rng is None:
+        rng = np.random.default_rng()
+    n_fresh = (num_simulations + 1) // 2
+    fresh = rng.standard_normal((years, n_fresh))
+    annual_returns = np.empty((years, num_simulations))
+    annual_returns[:, :n_fresh] = fresh
+    np.negative(fresh[:, :num_simulations - n_fresh], out=annual_returns[:, n_fresh:])
+    del fresh
+    annual_returns *= annual_volatility
+    annual_returns += annual_return_rate
+
+    portfolio = np.full(num_simulations, float(initial_deposit))
+    withdrawing = np.zeros(num_simulations, dtype=bool)
+    start_idx = np.full(num_simulations, -1, dtype=np.int64)
+
+    record_portfolio = record_path and record_portfolio
+    if record_path:
+        withdrawal_values = np.empty((num_simulations, years), dtype=PATH_DTYPE)
+    if record_portfolio:
+        portfolio_values = np.empty((num_simulations, years), dtype=PATH_DTYPE)
 
+    for yr in range(years):
         # 1) deposit if not retired
-        if not withdrawing:
-            portfolio_value += current_annual_deposit
-            # deposit grows for next year
-            current_annual_deposit *= (1 + deposit_growth_rate)
+        portfolio += np.where(withdrawing, 0.0, deposits[yr])
 
         # 2) apply random annual return
-        annual_return = random.gauss(annual_return_rate, annual_volatility)
-        portfolio_value *= (1 + annual_return)
-
-        # 3) check if we can retire (if not already)
-        pa, brt, hrt = get_tax_brackets_for_factor(tax_factor)
-        net_if_4_percent = calc_net_annual(annual_withdrawal_rate * portfolio_value, pa, brt, hrt)
-
-        just_retired_this_year = False
-        if (not withdrawing) and (net_if_4_percent >= current_annual_cost):
-            withdrawing = True
-            just_retired_this_year = True
-            start_withdrawal_date = current_year_date
-
-        # 4) if retired, withdraw once per year (but skip if we just retired this iteration)
-        if withdrawing and not just_retired_this_year:
-            if mode == "strict":
-                # Only withdraw exactly enough to net your cost
-                needed_gross = required_gross_annual_for_net_annual(current_annual_cost, pa, brt, hrt)
-                if portfolio_value >= needed_gross:
-                    withdrawal_amt = needed_gross
-                else:
-                    # partial if portfolio too small
-                    withdrawal_amt = max(0, portfolio_value)
-            else:  # mode == "four_percent"
-                withdrawal_amt = annual_withdrawal_rate * portfolio_value
-                if portfolio_value < withdrawal_amt:
-                    withdrawal_amt = max(0, portfolio_value)
-
-            portfolio_value -= withdrawal_amt
-        else:
-            withdrawal_amt = 0.0
-
-        total_withdrawn += withdrawal_amt
+        portfolio *= (1 + annual_returns[yr])
 
-        # track
-        year_list.append(yr)
-        dates_list.append(current_year_date)
-        portfolio_values.append(portfolio_value)
-        withdrawal_values.append(withdrawal_amt)
+        # 3) who retires this year (they skip this year's withdrawal)
+        just_retired = ~withdrawing & (annual_withdrawal_rate * portfolio >= gross_needed[yr])
 
-        # 5) inflate next year's living cost
-        current_annual_cost *= (1 + annual_inflation_rate)
+        # 4) withdraw for runs that retired in an earlier year. Computed for every run
+        #    and masked with np.where, so there's no gather/scatter on diverging paths.
+        if mode == "strict":
+            # Only withdraw exactly enough to net your cost (partial if portfolio too small)
+            withdrawal_amt = np.minimum(gross_needed[yr], np.maximum(portfolio, 0.0))
+        else:  # mode == "four_percent"
+            withdrawal_amt = np.maximum(np.minimum(annual_withdrawal_rate * portfolio, portfolio), 0.0)
+        withdrawal_amt = np.where(withdrawing, withdrawal_amt, 0.0)
+        portfolio -= withdrawal_amt
 
-        # 6) inflate tax brackets
-        tax_factor *= (1 + annual_inflation_rate)
+        withdrawing |= just_retired
+        start_idx[just_retired] = yr
 
-    return (dates_list, portfolio_values, withdrawal_values,
-            start_withdrawal_date, total_withdrawn)
+        # track
+        if record_path:
+            withdrawal_values[:, yr] = withdrawal_amt
+        if record_portfolio:
+            portfolio_values[:, yr] = portfolio
+
+    if not record_path:
+        return portfolio, start_idx
+    if record_portfolio:
+        return portfolio, start_idx, withdrawal_values, portfolio_values
+    return portfolio, start_idx, withdrawal_values
 
 ###############################
 # 3) GATHER ALL SIMS & FILTERED AVERAGE
@@ -172,49 +333,31 @@ def gather_all_runs_annual(
     annual_volatility,
     start_date,
     num_simulations,
-    mode
+    mode,
+    seed=None
 ):
     """
-    Run 'simulate_investment_annual' many times, storing results so we can post-process:
-      - We'll store each run's withdrawals by year
-      - We'll figure out which year that run started withdrawing
+    Run every simulation (chunked across cores for big batches), keeping what we need to post-process:
+      - each run's withdrawals by year
+      - which year that run started withdrawing
     """
-    all_withdrawals = []
-    retirement_years = []  # for each run, store the index of the first withdrawal year (or None if never)
-
-    dates_ref = None  # We'll store the final 'dates' from the first run
-    for _ in range(num_simulations):
-        dates, _, wvals, wd_date, _ = simulate_investment_annual(
-            initial_deposit,
-            annual_deposit,
-            deposit_growth_rate,
-            annual_return_rate,
-            annual_inflation_rate,
-            annual_withdrawal_rate,
-            target_annual_living_cost,
-            years,
-            annual_volatility,
-            start_date,
-            mode
-        )
-        if dates_ref is None:
-            dates_ref = dates
-
-        # Find the index of the first withdrawal > 0, or None
-        # OR if wd_date is returned, we can map it to an index
-        if wd_date is None:
-            first_wd_idx = None
-        else:
-            # find the year index
-            first_wd_idx = None
-            for i, d in enumerate(dates):
-                if d >= wd_date:
-                    first_wd_idx = i
-                    break
-
-        all_withdrawals.append(wvals)
-        retirement_years.append(first_wd_idx)
+    all_withdrawals, retirement_years, _ = _run_recorded_batch(
+        initial_deposit,
+        annual_deposit,
+        deposit_growth_rate,
+        annual_return_rate,
+        annual_inflation_rate,
+        annual_withdrawal_rate,
+        target_annual_living_cost,
+        years,
+        annual_volatility,
+        num_simulations,
+        mode,
+        seed
+    )
+    dates_ref = _annual_dates(start_date, years)
 
+    # retirement_years[run] is the index of the first withdrawal year (-1 if never)
     return dates_ref, all_withdrawals, retirement_years
 
 def compute_filtered_average_withdrawals(
@@ -228,37 +371,103 @@ def compute_filtered_average_withdrawals(
       - Gather withdrawal amounts from only those runs that are *already retired* by that year
       - Exclude top X% outliers
       - Average the remainder
-    Returns a list of length = years.
+    retirement_years holds each run's first withdrawal year index (-1 if never).
+    Returns an array of length = years.
     """
-    filtered_avg = []
+    all_withdrawals = np.asarray(all_withdrawals)
+    retired_from = np.asarray(retirement_years)
+
+    # (runs, years) mask of "this run is retired by this year", built with one
+    # broadcast compare instead of a per-run, per-year check
+    retired = (retired_from[:, None] >= 0) & (np.arange(years)[None, :] >= retired_from[:, None])
+    any_retired = retired.any(axis=0)
+    filtered_avg = np.zeros(years, dtype=np.float64)
 
     for year_idx in range(years):
-        # Collect the runs that have retired by this year
-        retired_wds = []
-        for run_idx, wd_series in enumerate(all_withdrawals):
-            first_wd_idx = retirement_years[run_idx]
-            # If run started withdrawing on or before 'year_idx'
-            if first_wd_idx is not None and year_idx >= first_wd_idx:
-                # This run is retired at year_idx
-                # So let's grab that run's withdrawal amount for year_idx
-                retired_wds.append(wd_series[year_idx])
-
-        if not retired_wds:
-            # No runs are retired => average = 0 (or could use None)
-            filtered_avg.append(0.0)
+        if not any_retired[year_idx]:
+            # No runs are retired => average stays 0
             continue
 
-        arr = np.array(retired_wds)
+        # Withdrawal amounts this year from the runs that have retired by now
+        arr = all_withdrawals[retired[:, year_idx], year_idx].astype(np.float64)
         # Exclude top X% outliers
         cutoff = np.percentile(arr, top_percentile)
         arr_filtered = arr[arr <= cutoff]
 
         # average the filtered set
-        avg_val = arr_filtered.mean() if len(arr_filtered) > 0 else 0.0
-        filtered_avg.append(avg_val)
+        filtered_avg[year_idx] = arr_filtered.mean() if len(arr_filtered) > 0 else 0.0
 
     return filtered_avg
 
+@st.cache_resource
+def _mc_executor():
+    """Worker threads for big Monte Carlo batches, shared across reruns instead of respawned."""
+    return ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+
+def _map_chunks(work, num_simulations, seed):
+    """
+    Call work(chunk_size, rng) over num_simulations runs and return the results in
+    chunk order. Runs are independent, so big batches are split across cores:
+    NumPy's RNG and ufuncs release the GIL on large arrays, so threads scale without
+    having to pickle anything into worker processes. Each chunk gets its own child
+    of the seed sequence, so the streams don't overlap.
+    The chunk layout comes from num_simulations alone (num_simulations // MC_CHUNK_SIZE
+    chunks) and the pool just schedules them, so a seed reproduces on any core count.
+    Batches under 2 * MC_CHUNK_SIZE runs stay in one chunk on the calling thread.
+    """
+    n_chunks = num_simulations // MC_CHUNK_SIZE
+    if n_chunks <= 1:
+        return [work(num_simulations, np.random.default_rng(seed))]
+    chunk_sizes = [
+        num_simulations // n_chunks + (i < num_simulations % n_chunks)
+        for i in range(n_chunks)
+    ]
+    chunk_rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n_chunks)]
+    return list(_mc_executor().map(work, chunk_sizes, chunk_rngs))
+
+def _run_recorded_batch(
+    initial_deposit,
+    annual_deposit,
+    deposit_growth_rate,
+    annual_return_rate,
+    annual_inflation_rate,
+    annual_withdrawal_rate,
+    target_annual_living_cost,
+    years,
+    annual_volatility,
+    num_simulations,
+    mode,
+    seed
+):
+    """
+    simulate_batch_annual over all runs via _map_chunks, recording withdrawals.
+    Returns (all_withdrawals, retirement_years, successes), where successes counts
+    runs that retired and ended above zero (checked on the float64 final values).
+    """
+    def run_chunk(chunk_size, rng):
+        final_values, start_idx, withdrawals = simulate_batch_annual(
+            initial_deposit,
+            annual_deposit,
+            deposit_growth_rate,
+            annual_return_rate,
+            annual_inflation_rate,
+            annual_withdrawal_rate,
+            target_annual_living_cost,
+            years,
+            annual_volatility,
+            chunk_size,
+            mode,
+            rng=rng
+        )
+        return withdrawals, start_idx, np.count_nonzero((start_idx >= 0) & (final_values > 0))
+
+    chunks = _map_chunks(run_chunk, num_simulations, seed)
+    if len(chunks) == 1:
+        return chunks[0]
+    all_withdrawals = np.concatenate([c[0] for c in chunks])
+    retirement_years = np.concatenate([c[1] for c in chunks])
+    return all_withdrawals, retirement_years, sum(c[2] for c in chunks)
+
 def run_monte_carlo_annual(
     initial_deposit,
     annual_deposit,
@@ -271,16 +480,17 @@ def run_monte_carlo_annual(
     annual_volatility,
     start_date,
     num_simulations,
-    mode
+    mode,
+    seed=None
 ):
     """
     We'll say a run is 'successful' if:
       (a) We eventually start withdrawing (i.e. can retire), AND
       (b) The portfolio is above zero at the end of the simulation.
+    Only the success rate is needed, so no per-year history is recorded.
     """
-    successes = 0
-    for _ in range(num_simulations):
-        _, pv, _, wd_date, _ = simulate_investment_annual(
+    def count_successes(chunk_size, rng):
+        final_values, start_idx = simulate_batch_annual(
             initial_deposit,
             annual_deposit,
             deposit_growth_rate,
@@ -290,27 +500,181 @@ def run_monte_carlo_annual(
             target_annual_living_cost,
             years,
             annual_volatility,
-            start_date,
-            mode
+            chunk_size,
+            mode,
+            record_path=False,
+            rng=rng
         )
-        if wd_date is not None and pv[-1] > 0:
-            successes += 1
+        return np.count_nonzero((start_idx >= 0) & (final_values > 0))
+
+    successes = sum(_map_chunks(count_successes, num_simulations, seed))
     return (successes / num_simulations) * 100
 
+def run_all_annual(
+    initial_deposit,
+    annual_deposit,
+    deposit_growth_rate,
+    annual_return_rate,
+    annual_inflation_rate,
+    annual_withdrawal_rate,
+    target_annual_living_cost,
+    years,
+    annual_volatility,
+    num_simulations,
+    mode,
+    seed=None
+):
+    """
+    One batch feeds everything main() shows, instead of a separate Monte Carlo for
+    the probability and another for the withdrawals (which also meant the two came
+    from different random draws). The batch is chunked across cores the same way
+    run_monte_carlo_annual is, and the success count comes out of that same pass.
+    Returns (probability, all_withdrawals, retirement_years), with the last two
+    shaped like gather_all_runs_annual's output. The date axis isn't needed to
+    simulate, so callers build it themselves with _annual_dates.
+    """
+    all_withdrawals, retirement_years, successes = _run_recorded_batch(
+        initial_deposit,
+        annual_deposit,
+        deposit_growth_rate,
+        annual_return_rate,
+        annual_inflation_rate,
+        annual_withdrawal_rate,
+        target_annual_living_cost,
+        years,
+        annual_volatility,
+        num_simulations,
+        mode,
+        seed
+    )
+    probability = (successes / num_simulations) * 100
+    return probability, all_withdrawals, retirement_years
+
+@dataclass(frozen=True, slots=True)
+class SimParams:
+    """
+    The numeric simulation inputs, in the positional order the simulation
+    functions take them. Frozen, so one instance can be shared and hashed
+    as a cache key.
+    """
+    initial_deposit: float
+    annual_deposit: float
+    deposit_growth_rate: float
+    annual_return_rate: float
+    annual_inflation_rate: float
+    annual_withdrawal_rate: float
+    target_annual_living_cost: float
+    years: int
+    annual_volatility: float
+
+# Bound the simulation cache. Entries only hold the probability and the per-year
+# filtered averages (a few hundred bytes), never the (runs, years) matrix.
+SIM_CACHE_MAX_ENTRIES = 32
+
+# Upper limit on the run count. A recorded batch holds float64 draws per chunk plus a
+# float32 withdrawal history (and one copy of it when chunks are joined), which at
+# 60 years peaks around 125 MB (~8 bytes per run-year, measured). It is all freed once
+# run_all_cached reduces it, so only the per-year averages outlive the run.
+MAX_SIMULATIONS = 250_000
+
+@st.cache_data(show_spinner=False, max_entries=SIM_CACHE_MAX_ENTRIES)
+def run_all_cached(params, num_simulations, mode, seed, top_percentile=95):
+    """
+    run_all_annual reduced to what main() shows -- (probability, filtered_avg) --
+    and memoised across Streamlit reruns. The full withdrawal matrix is dropped as
+    soon as it's averaged, so the shared cache stays tiny whatever the run count.
+    'params' is a SimParams; same key + seed => same result. The start date only
+    moves the date axis, so it is kept out of the key and changing it doesn't
+    re-run the simulation.
+    """
+    probability, all_withdrawals, retirement_years = run_all_annual(
+        *astuple(params), num_simulations, mode, seed=seed
+    )
+    filtered_avg = compute_filtered_average_withdrawals(
+        all_withdrawals,
+        retirement_years,
+        params.years,
+        top_percentile=top_percentile
+    )
+    return probability, filtered_avg
+
 ##############################
 # 4) STREAMLIT DISPLAY FUNCS
 ##############################
+# Plot styling never changes between reruns, so build it once at import
+WITHDRAWAL_LINE = dict(color='yellow', width=3)
+WITHDRAWAL_START_COLOR = "green"
+WITHDRAWAL_PLOT_LAYOUT = dict(
+    title="Annual Withdrawals (Filtered Avg) — Top 5% outliers removed",
+    xaxis_title="Year Index (Date Shown)",
+    yaxis_title="£",
+    hovermode="x unified",
+    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    margin=dict(l=40, r=40, t=60, b=40)
+)
+
+def first_withdrawal_index(withdrawals, threshold=1e-9):
+    """Index of the first year with a withdrawal above threshold (None if there isn't one)."""
+    hits = np.flatnonzero(np.asarray(withdrawals) > threshold)
+    return int(hits[0]) if hits.size else None
+
+def create_withdrawal_plot(dates, filtered_withdrawals):
+    """
+    Yearly plot of the filtered-average withdrawals. Arrays (not lists) let Plotly
+    serialise the data as typed buffers, and Scattergl draws on a WebGL canvas
+    instead of SVG nodes.
+    """
+    # Plotly is only imported once there's something to draw, so a cold start
+    # gets the sidebar on screen without waiting for it
+    import plotly.graph_objects as go
+
+    x_vals = np.array(dates, dtype="datetime64[D]")
+
+    # Mark the first year we see withdrawals
+    shapes, annotations = [], []
+    first_wd_idx = first_withdrawal_index(filtered_withdrawals)
+    if first_wd_idx is not None:
+        x_val = dates[first_wd_idx]
+        y_val = filtered_withdrawals[first_wd_idx]
+        shapes.append(dict(
+            type="line", xref="x", yref="paper", x0=x_val, x1=x_val, y0=0, y1=1,
+            line=dict(width=2, dash="dash", color=WITHDRAWAL_START_COLOR)
+        ))
+        annotations.append(dict(
+            x=x_val,
+            y=y_val,
+            text="Withdrawal Start (Filtered Avg)",
+            showarrow=True,
+            arrowhead=2,
+            ax=0,
+            ay=-40,
+            font=dict(color=WITHDRAWAL_START_COLOR),
+            arrowcolor=WITHDRAWAL_START_COLOR
+        ))
+
+    # Build trace and layout in one constructor so Plotly validates the figure once
+    fig = go.Figure(
+        data=[
+            go.Scattergl(
+                x=x_vals,
+                y=np.asarray(filtered_withdrawals, dtype=np.float64),
+                name="Withdrawal (Filtered Avg)",
+                mode='lines+markers',
+                line=WITHDRAWAL_LINE
+            )
+        ],
+        layout=go.Layout(shapes=shapes, annotations=annotations, **WITHDRAWAL_PLOT_LAYOUT)
+    )
+    return fig
+
 def display_summary_for_filtered_annual(dates, filtered_withdrawals):
     """Display a summary for our new 'filtered average' approach."""
     import streamlit as st
-    first_wd_idx = None
-    for i, w in enumerate(filtered_withdrawals):
-        if w > 1e-9:
-            first_wd_idx = i
-            break
+    withdrawals_arr = np.asarray(filtered_withdrawals, dtype=np.float64)
+    first_wd_idx = first_withdrawal_index(withdrawals_arr)
 
-    total_withdrawn = sum(filtered_withdrawals)
-    final_wd = filtered_withdrawals[-1]
+    total_withdrawn = float(withdrawals_arr.sum())
+    final_wd = float(withdrawals_arr[-1])
 
     st.subheader("Summary (Filtered Average of Retired Runs)")
     if first_wd_idx is None:
@@ -323,6 +687,18 @@ def display_summary_for_filtered_annual(dates, filtered_withdrawals):
         st.write(f"• Total filtered-average withdrawn (sum of each year’s filtered mean): £{total_withdrawn:,.2f}")
         st.write(f"• Final year’s withdrawal: £{final_wd:,.2f}")
 
+MEME_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif'})
+
+MEME_LIST_TTL = 3600  # seconds; new memes dropped into a folder show up within the hour
+
+@st.cache_data(show_spinner=False, ttl=MEME_LIST_TTL)
+def _list_memes(folder):
+    """Image paths in a meme folder, cached so reruns don't re-scan the directory."""
+    return tuple(
+        os.path.join(folder, f) for f in os.listdir(folder)
+        if os.path.splitext(f)[1].lower() in MEME_EXTENSIONS
+    )
+
 def display_memes(probability):
     """Simple meme logic. Adjust or remove as needed."""
     good_memes_folder = "goodMemes"
@@ -338,15 +714,13 @@ def display_memes(probability):
         meme_folder = bad_memes_folder
 
     try:
-        all_files = os.listdir(meme_folder)
-        image_files = [f for f in all_files if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif'))]
-        if not image_files:
+        meme_paths = _list_memes(meme_folder)
+        if not meme_paths:
             st.write(f"No meme images found in '{meme_folder}'.")
             return
-        chosen_meme = random.choice(image_files)
-        meme_path = os.path.join(meme_folder, chosen_meme)
+        meme_path = random.choice(meme_paths)
         col1, col2, col3 = st.columns([1, 2, 1])
-        col2.image(meme_path, caption=chosen_meme, width=300)
+        col2.image(meme_path, caption=os.path.basename(meme_path), width=300)
     except Exception as e:
         st.write(f"Could not load memes from folder '{meme_folder}'")
         st.write(e)
@@ -436,6 +810,7 @@ def main():
     user_num_sims = st.sidebar.number_input(
         "Monte Carlo Simulations",
         min_value=1,
+        max_value=MAX_SIMULATIONS,
         value=default_params["num_simulations"],
         step=10
     )
@@ -448,6 +823,19 @@ def main():
         help="strict = only withdraw exactly enough to net your living cost; four_percent = always withdraw 4% once retired"
     )
 
+    # Seed is fixed for the session so identical inputs hit the cache on reruns;
+    # type one in to reproduce (or share) a particular run
+    if "mc_seed" not in st.session_state:
+        st.session_state["mc_seed"] = random.randrange(2**32)
+    mc_seed = int(st.sidebar.number_input(
+        "Random Seed",
+        min_value=0,
+        max_value=2**32 - 1,
+        step=1,
+        key="mc_seed",
+        help="Same seed + same inputs = same results"
+    ))
+
     # Convert percentages => decimals
     user_annual_inflation_rate /= 100.0
     user_deposit_growth_rate /= 100.0
@@ -455,21 +843,26 @@ def main():
     user_annual_withdrawal_rate /= 100.0
     user_annual_volatility /= 100.0
 
-    # === RUN MONTE CARLO
-    probability = run_monte_carlo_annual(
-        user_initial_deposit,
-        user_annual_deposit,
-        user_deposit_growth_rate,
-        user_annual_return_rate,
-        user_annual_inflation_rate,
-        user_annual_withdrawal_rate,
-        user_target_annual_living_cost,
-        user_years,
-        user_annual_volatility,
-        user_start_date,
+    sim_params = SimParams(
+        initial_deposit=user_initial_deposit,
+        annual_deposit=user_annual_deposit,
+        deposit_growth_rate=user_deposit_growth_rate,
+        annual_return_rate=user_annual_return_rate,
+        annual_inflation_rate=user_annual_inflation_rate,
+        annual_withdrawal_rate=user_annual_withdrawal_rate,
+        target_annual_living_cost=user_target_annual_living_cost,
+        years=user_years,
+        annual_volatility=user_annual_volatility
+    )
+    # === RUN MONTE CARLO + BUILD FILTERED AVG (one batch, reduced inside the cache)
+    probability, filtered_avg_wds = run_all_cached(
+        sim_params,
         user_num_sims,
-        user_mode
+        user_mode,
+        mc_seed,
+        top_percentile=95  # removing top 5% outliers each year
     )
+    dates_ref = _annual_dates(user_start_date, user_years)
 
     color = "#2ecc71" if probability >= 50 else "#e74c3c"
     st.markdown(
@@ -483,71 +876,7 @@ def main():
         unsafe_allow_html=True
     )
 
-    # === GATHER ALL RUNS (WITHDRAWALS) & BUILD FILTERED AVG
-    dates_ref, all_withdrawals, retirement_years = gather_all_runs_annual(
-        user_initial_deposit,
-        user_annual_deposit,
-        user_deposit_growth_rate,
-        user_annual_return_rate,
-        user_annual_inflation_rate,
-        user_annual_withdrawal_rate,
-        user_target_annual_living_cost,
-        user_years,
-        user_annual_volatility,
-        user_start_date,
-        user_num_sims,
-        user_mode
-    )
-
-    filtered_avg_wds = compute_filtered_average_withdrawals(
-        all_withdrawals,
-        retirement_years,
-        user_years,
-        top_percentile=95  # removing top 5% outliers each year
-    )
-
-    # Build a yearly plot
-    fig = go.Figure()
-    x_vals = [dates_ref[i] for i in range(user_years)]
-
-    # Plot the filtered-average withdrawals
-    fig.add_trace(
-        go.Scatter(
-            x=x_vals,
-            y=filtered_avg_wds,
-            name="Withdrawal (Filtered Avg)",
-            mode='lines+markers',
-            line=dict(color='yellow', width=3)
-        )
-    )
-
-    # Mark the first year we see withdrawals
-    first_wd_idx = next((i for i, w in enumerate(filtered_avg_wds) if w > 1e-9), None)
-    if first_wd_idx is not None:
-        x_val = x_vals[first_wd_idx]
-        y_val = filtered_avg_wds[first_wd_idx]
-        fig.add_vline(x=x_val, line_width=2, line_dash="dash", line_color="green")
-        fig.add_annotation(
-            x=x_val,
-            y=y_val,
-            text="Withdrawal Start (Filtered Avg)",
-            showarrow=True,
-            arrowhead=2,
-            ax=0,
-            ay=-40,
-            font=dict(color="green"),
-            arrowcolor="green"
-        )
-
-    fig.update_layout(
-        title=f"Annual Withdrawals (Filtered Avg) — Top 5% outliers removed",
-        xaxis_title="Year Index (Date Shown)",
-        yaxis_title="£",
-        hovermode="x unified",
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        margin=dict(l=40, r=40, t=60, b=40)
-    )
-
+    fig = create_withdrawal_plot(dates_ref, filtered_avg_wds)
     st.plotly_chart(fig, use_container_width=True)
 
     # Show textual summary for the filtered-withdrawal approach